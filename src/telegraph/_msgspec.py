@@ -0,0 +1,97 @@
+from typing import Any, Generic, List, Optional, TypeVar
+
+import msgspec
+
+from .types import Account, Page, PageList, PageViews
+
+
+T = TypeVar('T')
+
+
+class AccountStruct(msgspec.Struct):
+    short_name: Optional[str] = None
+    author_name: Optional[str] = None
+    author_url: Optional[str] = None
+    access_token: Optional[str] = None
+    auth_url: Optional[str] = None
+    page_count: Optional[int] = None
+
+class PageStruct(msgspec.Struct):
+    path: str
+    url: str
+    title: str
+    description: str
+    author_name: Optional[str] = None
+    author_url: Optional[str] = None
+    image_url: Optional[str] = None
+    content: Optional[List[Any]] = None
+    views: Optional[int] = None
+    can_edit: Optional[bool] = None
+
+class PageListStruct(msgspec.Struct):
+    total_count: int
+    pages: List[PageStruct]
+
+class PageViewsStruct(msgspec.Struct):
+    views: int
+
+class Response(msgspec.Struct, Generic[T]):
+    ok: bool
+    result: Optional[T] = None
+    error: Optional[str] = None
+
+
+_account_decoder = msgspec.json.Decoder(Response[AccountStruct])
+_page_decoder = msgspec.json.Decoder(Response[PageStruct])
+
+DECODERS = {
+    'createAccount': _account_decoder,
+    'createPage': _page_decoder,
+    'editAccountInfo': _account_decoder,
+    'editPage': _page_decoder,
+    'getAccountInfo': _account_decoder,
+    'getPage': _page_decoder,
+    'getPageList': msgspec.json.Decoder(Response[PageListStruct]),
+    'getViews': msgspec.json.Decoder(Response[PageViewsStruct]),
+    'revokeAccessToken': _account_decoder
+}
+
+
+def decode_account(data: AccountStruct) -> Account:
+    return Account(
+        short_name=data.short_name,
+        author_name=data.author_name,
+        author_url=data.author_url,
+        access_token=data.access_token,
+        auth_url=data.auth_url,
+        page_count=data.page_count
+    )
+
+def decode_page(data: PageStruct) -> Page:
+    return Page(
+        path=data.path,
+        url=data.url,
+        title=data.title,
+        description=data.description,
+        author_name=data.author_name,
+        author_url=data.author_url,
+        image_url=data.image_url,
+        content=data.content,
+        views=data.views,
+        can_edit=data.can_edit
+    )
+
+def decode_page_list(data: PageListStruct) -> PageList:
+    return PageList(data.total_count, [decode_page(page_data) for page_data in data.pages])
+
+def decode_page_views(data: PageViewsStruct) -> PageViews:
+    return PageViews(data.views)
+
+
+__all__ = [
+    'DECODERS',
+    'decode_account',
+    'decode_page',
+    'decode_page_list',
+    'decode_page_views'
+]
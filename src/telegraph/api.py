@@ -1,41 +1,288 @@
+import asyncio
+import importlib.util
+import random
 import aiohttp
-from typing import Any, List, Dict
-from .types import Account, NodeElement, Page, PageViews
+import orjson
+import yarl
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# httpx.AsyncClient(http2=True) also needs h2.
+if httpx is not None and importlib.util.find_spec('h2') is None:
+    httpx = None
+from typing import Any, Awaitable, Dict, Iterable, List, Tuple
+from .types import Account, NodeElement, Page, PageList, PageViews
+
+try:
+    from . import _msgspec
+except ImportError:
+    _msgspec = None
+
+
+_METHODS = (
+    'createAccount',
+    'createPage',
+    'editAccountInfo',
+    'editPage',
+    'getAccountInfo',
+    'getPage',
+    'getPageList',
+    'getViews',
+    'revokeAccessToken'
+)
+# Only read-only methods are safe to repeat after the server may have
+# handled the request; the others are retried on 429/FLOOD_WAIT or when the
+# connection could not be established.
+_IDEMPOTENT_METHODS = frozenset({'getAccountInfo', 'getPage', 'getPageList', 'getViews'})
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+_UNSAFE_RETRY_STATUSES = frozenset({429})
+_NO_RETRY_STATUSES = frozenset()
+_RETRY_BASE = 0.5
+_RETRY_CAP = 30.0
+_RETRY_JITTER = 0.5
 
 
 class TelegraphException(Exception):
     pass
 
+def _backoff(attempt: int) -> float:
+    return min(_RETRY_CAP, _RETRY_BASE * 2 ** attempt) + random.uniform(0, _RETRY_JITTER)
+
+def _retry_after(headers: Any, attempt: int) -> float:
+    value = headers.get('Retry-After')
+    if value is not None and value.isdigit():
+        delay = float(value)
+        if delay > _RETRY_CAP:
+            raise TelegraphException(f'Retry-After of {value}s exceeds the {_RETRY_CAP:g}s retry cap.')
+        return delay
+    return _backoff(attempt)
+
+async def _gather_limited(coros: Iterable[Awaitable[Any]], concurrency: int) -> List[Any]:
+    # coros should be a generator so that nothing is created when
+    # concurrency is rejected.
+    if concurrency < 1:
+        raise ValueError('concurrency must be at least 1.')
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(coro: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await coro
+
+    return list(await asyncio.gather(*[run(coro) for coro in coros]))
+
+def _default(obj: Any) -> Any:
+    # NodeElement trees are handed to orjson as-is; empty attrs/children are
+    # omitted instead of being sent as null. Children are sent unfiltered, and
+    # each node adds two levels against orjson's recursion limit, so trees
+    # nested deeper than about 127 nodes fail to encode.
+    if isinstance(obj, NodeElement):
+        result = {'tag': obj.tag}
+        if obj.attrs:
+            result['attrs'] = obj.attrs
+        if obj.children:
+            result['children'] = obj.children
+        return result
+    raise TypeError
+
+def _decode_account(data: Dict[str, Any]) -> Account:
+    # Only known keys are read; revokeAccessToken and getAccountInfo with
+    # fields return a subset of them.
+    return Account(
+        short_name=data.get('short_name'),
+        author_name=data.get('author_name'),
+        author_url=data.get('author_url'),
+        access_token=data.get('access_token'),
+        auth_url=data.get('auth_url'),
+        page_count=data.get('page_count')
+    )
+
+def _decode_page(data: Dict[str, Any]) -> Page:
+    return Page(
+        path=data['path'],
+        url=data['url'],
+        title=data['title'],
+        description=data['description'],
+        author_name=data.get('author_name'),
+        author_url=data.get('author_url'),
+        image_url=data.get('image_url'),
+        content=data.get('content'),
+        views=data.get('views'),
+        can_edit=data.get('can_edit')
+    )
+
+def _decode_page_list(data: Dict[str, Any]) -> PageList:
+    return PageList(data['total_count'], [_decode_page(page_data) for page_data in data['pages']])
+
+def _decode_page_views(data: Dict[str, Any]) -> PageViews:
+    return PageViews(data['views'])
+
 class Telegraph():
     '''
     Async wrapper for Telegraph API.
+
+    A single instance (and its session) is meant to be reused for many calls,
+    so that keep-alive connections to api.telegra.ph are shared between them.
+    An existing ``aiohttp.ClientSession`` can be passed in; it is then left
+    open on exit.
+
+    With ``transport='httpx'`` requests go through ``httpx.AsyncClient`` with
+    HTTP/2 enabled, multiplexing concurrent calls over one connection. This
+    requires ``httpx[http2]``; an injected session must then be an
+    ``httpx.AsyncClient``. Its 10 second timeout applies to each phase
+    (connect, write, read, pool) rather than to the whole request as with
+    aiohttp.
+
+    At most ``rate_limit`` requests are in flight at once. HTTP 429 and
+    ``FLOOD_WAIT_X`` API errors are retried up to ``max_retries`` times with
+    exponential backoff, honoring ``Retry-After`` and the flood wait interval
+    when the server provides them; waits longer than the retry cap raise
+    ``TelegraphException`` instead. Read-only methods are also retried on
+    timeouts, connection errors and HTTP 5xx, methods that modify data only
+    when the connection could not be established.
+
+    With ``use_msgspec=True`` responses are decoded by msgspec straight into
+    typed structs, skipping the intermediate dicts, before being converted to
+    the public dataclasses. This requires ``msgspec``.
     '''
     def __init__(
         self,
-        access_token: str | None = None
+        access_token: str | None = None,
+        session: 'aiohttp.ClientSession | httpx.AsyncClient | None' = None,
+        rate_limit: int = 64,
+        max_retries: int = 3,
+        transport: str = 'aiohttp',
+        use_msgspec: bool = False
     ):
+        if transport not in ('aiohttp', 'httpx'):
+            raise ValueError(f'Unknown transport: {transport!r}.')
+        if rate_limit < 1:
+            raise ValueError('rate_limit must be at least 1.')
+        if max_retries < 0:
+            raise ValueError('max_retries must not be negative.')
+        if transport == 'httpx' and httpx is None:
+            raise RuntimeError('The httpx transport requires "httpx[http2]" to be installed.')
+        session_type = httpx.AsyncClient if transport == 'httpx' else aiohttp.ClientSession
+        if session is not None and not isinstance(session, session_type):
+            raise TypeError(
+                f'The {transport} transport needs a {session_type.__module__}.{session_type.__name__} session, '
+                f'got {type(session).__name__}.'
+            )
+        if use_msgspec and _msgspec is None:
+            raise RuntimeError('use_msgspec requires "msgspec" to be installed.')
+
         self.base_url = 'https://api.telegra.ph/'
         self.access_token = access_token
+        self.session = session
+        self.max_retries = max_retries
+        self.transport = transport
+        if use_msgspec:
+            self._decoders = _msgspec.DECODERS
+            self._decode_account = _msgspec.decode_account
+            self._decode_page = _msgspec.decode_page
+            self._decode_page_list = _msgspec.decode_page_list
+            self._decode_page_views = _msgspec.decode_page_views
+        else:
+            self._decoders = {}
+            self._decode_account = _decode_account
+            self._decode_page = _decode_page
+            self._decode_page_list = _decode_page_list
+            self._decode_page_views = _decode_page_views
+        self._owns_session = session is None
+        self._semaphore = asyncio.Semaphore(rate_limit)
+        if transport == 'httpx':
+            self._post = self._post_httpx
+            self._urls = {method: httpx.URL(f'{self.base_url}{method}') for method in _METHODS}
+            self._retry_errors = (httpx.TransportError,)
+            # Raised before the request reached the server.
+            self._connect_errors = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+        else:
+            self._post = self._post_aiohttp
+            self._urls = {method: yarl.URL(f'{self.base_url}{method}') for method in _METHODS}
+            self._retry_errors = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+            self._connect_errors = (aiohttp.ClientConnectorError,)
+        self._json_headers = {'Accept': 'application/json', 'Content-Type': 'application/json'}
+
+    @property
+    def access_token(self) -> str | None:
+        return self._access_token
+
+    @access_token.setter
+    def access_token(self, value: str | None):
+        self._access_token = value
+        self._default_params = {'access_token': value} if value else {}
+
+    def _session_closed(self) -> bool:
+        if self.transport == 'httpx':
+            return self.session.is_closed
+        return self.session.closed
 
     async def __aenter__(self):
-        timeout = aiohttp.ClientTimeout(total=10)
-        self.session = aiohttp.ClientSession(timeout=timeout)
+        if self.session is None or self._session_closed():
+            self._owns_session = True
+            if self.transport == 'httpx':
+                self.session = httpx.AsyncClient(
+                    http2=True,
+                    # Per phase; httpx has no total timeout.
+                    timeout=httpx.Timeout(10),
+                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=100),
+                    headers=self._json_headers
+                )
+                return self
+
+            timeout = aiohttp.ClientTimeout(total=10)
+            connector = aiohttp.TCPConnector(
+                limit=64,
+                limit_per_host=64,
+                ttl_dns_cache=300,
+                keepalive_timeout=75
+            )
+            self.session = aiohttp.ClientSession(
+                timeout=timeout,
+                connector=connector,
+                headers=self._json_headers
+            )
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        if self.session and self._owns_session:
+            if self.transport == 'httpx':
+                await self.session.aclose()
+            else:
+                await self.session.close()
+            self.session = None
 
-    async def _request(self, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
-        if not self.session:
-            raise RuntimeError('Session is not initialized. Use "async with Telegraph(...)" or pass a session.')
-        
-        if method != 'createAccount':
-            if self.access_token:
-                params['access_token'] = self.access_token
+    # _post_httpx/_post_aiohttp return (status, headers, body) for successful
+    # and retryable responses and raise the transport's own HTTP error
+    # otherwise; __init__ binds one of them as self._post.
+    async def _post_httpx(
+        self,
+        url: 'httpx.URL',
+        body: bytes,
+        headers: Dict[str, str] | None,
+        retry_statuses: frozenset
+    ) -> Tuple[int, Any, bytes]:
+        resp = await self.session.post(url, content=body, headers=headers)
+        if resp.status_code != 200 and resp.status_code not in retry_statuses:
+            raise httpx.HTTPStatusError(
+                f'HTTP {resp.status_code}: {resp.text}',
+                request=resp.request,
+                response=resp
+            )
+        return resp.status_code, resp.headers, resp.content
 
-        async with self.session.post(f'{self.base_url}/{method}', json=params) as resp:
-            if resp.status != 200:
+    async def _post_aiohttp(
+        self,
+        url: yarl.URL,
+        body: bytes,
+        headers: Dict[str, str] | None,
+        retry_statuses: frozenset
+    ) -> Tuple[int, Any, bytes]:
+        async with self.session.post(url, data=body, headers=headers) as resp:
+            if resp.status != 200 and resp.status not in retry_statuses:
                 text = await resp.text()
                 raise aiohttp.ClientResponseError(
                     request_info=resp.request_info,
@@ -44,13 +291,64 @@ class Telegraph():
                     message=f'HTTP {resp.status}: {text}',
                     headers=resp.headers,
                 )
-            
-            data = await resp.json()
-            if not data['ok']:
+            return resp.status, resp.headers, await resp.read()
+
+    async def _request(self, method: str, **params: Any) -> Any:
+        if not self.session:
+            raise RuntimeError('Session is not initialized. Use "async with Telegraph(...)" or pass a session.')
+        
+        # params is the fresh kwargs dict of this call, so None values are
+        # dropped in place rather than copied into a filtered dict.
+        for key in [key for key, value in params.items() if value is None]:
+            del params[key]
+        body = orjson.dumps(params, default=_default, option=orjson.OPT_PASSTHROUGH_DATACLASS)
+        url = self._urls[method]
+        # Owned sessions already carry the JSON headers.
+        headers = None if self._owns_session else self._json_headers
+        if method in _IDEMPOTENT_METHODS:
+            retry_statuses = _RETRY_STATUSES
+            retry_errors = self._retry_errors
+        else:
+            retry_statuses = _UNSAFE_RETRY_STATUSES
+            retry_errors = self._connect_errors
+
+        for attempt in range(self.max_retries + 1):
+            retry = attempt < self.max_retries
+            try:
+                async with self._semaphore:
+                    status, resp_headers, raw = await self._post(
+                        url, body, headers, retry_statuses if retry else _NO_RETRY_STATUSES
+                    )
+            except retry_errors:
+                if not retry:
+                    raise
+                await asyncio.sleep(_backoff(attempt))
+                continue
+
+            if status != 200:
+                await asyncio.sleep(_retry_after(resp_headers, attempt))
+                continue
+
+            decoder = self._decoders.get(method)
+            if decoder is None:
+                data = orjson.loads(raw)
+                if data['ok']:
+                    return data['result']
                 error = data['error']
+            else:
+                response = decoder.decode(raw)
+                if response.ok:
+                    return response.result
+                error = response.error
+
+            if not (error.startswith('FLOOD_WAIT_') and retry):
                 raise TelegraphException(f'API Error: {error}')
 
-            return data['result']
+            wait = error[len('FLOOD_WAIT_'):]
+            delay = float(wait) if wait.isdigit() else _backoff(attempt)
+            if delay > _RETRY_CAP:
+                raise TelegraphException(f'API Error: {error}')
+            await asyncio.sleep(delay)
 
     async def create_account(
         self,
@@ -75,20 +373,20 @@ class Telegraph():
         :return: On success, returns an Account object with the regular fields and an additional access_token field.
         :rtype: Account
         '''
-        params = {
-            'short_name': short_name,
-            'author_name': author_name,
-            'author_url': author_url
-        }
-        data = await self._request('createAccount', params)
-        account = Account(**data)
+        data = await self._request(
+            'createAccount',
+            short_name=short_name,
+            author_name=author_name,
+            author_url=author_url
+        )
+        account = self._decode_account(data)
         self.access_token = account.access_token
         return account
 
     async def create_page(
         self,
         title: str,
-        content: List[NodeElement],
+        content: List[NodeElement] | bytes | str | orjson.Fragment,
         author_name: str | None = None,
         author_url: str | None = None,
         return_content: bool = False
@@ -100,8 +398,9 @@ class Telegraph():
         
         :param title: Page title.
         :type title: str
-        :param content: Content of the page.
-        :type content: list[NodeElement]
+        :param content: Content of the page. Already serialized JSON (an array of Node)
+            can be passed as bytes, str or ``orjson.Fragment`` and is sent verbatim.
+        :type content: list[NodeElement] | bytes | str | orjson.Fragment
         :param author_name: Author name, displayed below the article's title.
         :type author_name: str | None
         :param author_url: Profile link, opened when users click on the author's name below the title.
@@ -112,17 +411,18 @@ class Telegraph():
         :return: On success, returns a Page object.
         :rtype: Page
         '''
-        content = [node.as_dict() for node in content]
-        params = {
-            'access_token': self.access_token,
-            'title': title,
-            'content': content,
-            'author_name': author_name,
-            'author_url': author_url,
-            'return_content': return_content
-        }
-        data = await self._request('createPage', params)
-        page = Page(**data)
+        if type(content) is bytes or type(content) is str:
+            content = orjson.Fragment(content)
+        data = await self._request(
+            'createPage',
+            **self._default_params,
+            title=title,
+            content=content,
+            author_name=author_name,
+            author_url=author_url,
+            return_content=return_content
+        )
+        page = self._decode_page(data)
         return page
 
     async def edit_account_info(
@@ -146,21 +446,23 @@ class Telegraph():
         :return: On success, returns an Account object with the default fields.
         :rtype: Account
         '''
-        params = {
-            'short_name': short_name,
-            'author_name': author_name,
-            'author_url': author_url
-        }
-        data = await self._request('editAccountInfo', params)
-        account = Account(**data)
-        self.access_token = account.access_token
+        data = await self._request(
+            'editAccountInfo',
+            **self._default_params,
+            short_name=short_name,
+            author_name=author_name,
+            author_url=author_url
+        )
+        account = self._decode_account(data)
+        if account.access_token:
+            self.access_token = account.access_token
         return account
 
     async def edit_page(
         self,
         path: str,
         title: str,
-        content: List[NodeElement],
+        content: List[NodeElement] | bytes | str | orjson.Fragment,
         author_name: str | None = None,
         author_url: str | None = None,
         return_content: bool = False
@@ -174,8 +476,9 @@ class Telegraph():
         :type path: str
         :param title: Page title.
         :type title: str
-        :param content: Content of the page.
-        :type content: list[NodeElement]
+        :param content: Content of the page. Already serialized JSON (an array of Node)
+            can be passed as bytes, str or ``orjson.Fragment`` and is sent verbatim.
+        :type content: list[NodeElement] | bytes | str | orjson.Fragment
         :param author_name: Author name, displayed below the article's title.
         :type author_name: str | None
         :param author_url: Profile link, opened when users click on the author's name below the title.
@@ -186,17 +489,19 @@ class Telegraph():
         :return: On success, returns a Page object.
         :rtype: Page
         '''
-        content = [node.as_dict() for node in content]
-        params = {
-            'path': path,
-            'title': title,
-            'content': content,
-            'author_name': author_name,
-            'author_url': author_url,
-            'return_content': return_content
-        }
-        data = await self._request('editPage', params)
-        page = Page(**data)
+        if type(content) is bytes or type(content) is str:
+            content = orjson.Fragment(content)
+        data = await self._request(
+            'editPage',
+            **self._default_params,
+            path=path,
+            title=title,
+            content=content,
+            author_name=author_name,
+            author_url=author_url,
+            return_content=return_content
+        )
+        page = self._decode_page(data)
         return page
 
     async def get_account_info(
@@ -213,11 +518,12 @@ class Telegraph():
         :return: Returns an Account object on success.
         :rtype: Account
         '''
-        params = {
-            'fields': fields
-        }
-        data = await self._request('getAccountInfo', params)
-        account = Account(**data)
+        data = await self._request(
+            'getAccountInfo',
+            **self._default_params,
+            fields=fields
+        )
+        account = self._decode_account(data)
         return account
 
     async def get_page(
@@ -237,14 +543,40 @@ class Telegraph():
         :return: Returns a Page object on success.
         :rtype: Page
         '''
-        params = {
-            'path': path,
-            'return_content': return_content
-        }
-        data = await self._request('getPage', params)
-        page = Page(**data)
+        data = await self._request(
+            'getPage',
+            **self._default_params,
+            path=path,
+            return_content=return_content
+        )
+        page = self._decode_page(data)
         return page
 
+    async def get_pages(
+        self,
+        paths: List[str],
+        return_content: bool | None = None,
+        concurrency: int = 64
+    ) -> List[Page]:
+        '''
+        Get several Telegraph pages concurrently over the same session.
+
+        Requests are issued in parallel, at most ``concurrency`` at a time.
+        The default matches the connector's per-host limit, so raising it only
+        helps together with a session allowing more connections.
+
+        :param paths: Paths to the Telegraph pages.
+        :type paths: list[str]
+        :param return_content: If true, content field will be returned in Page objects.
+        :type return_content: bool
+        :param concurrency: Maximum number of requests in flight.
+        :type concurrency: int
+        :return: Returns a list of Page objects in the order of paths.
+        :rtype: list[Page]
+        '''
+        pages = await _gather_limited((self.get_page(path, return_content) for path in paths), concurrency)
+        return pages
+
     async def get_page_list(
         self,
         limit: int | None = None,
@@ -266,12 +598,52 @@ class Telegraph():
         :return: Returns a PageList object, sorted by most recently created pages first.
         :rtype: list[Page]
         '''
-        params = {
-            'offset': offset,
-            'limit': limit
-        }
-        data = await self._request('getPageList', params)
-        pages = [Page(**page_data) for page_data in data['pages']]
+        data = await self._request(
+            'getPageList',
+            **self._default_params,
+            offset=offset,
+            limit=limit
+        )
+        page_list = self._decode_page_list(data)
+        return page_list.pages
+
+    async def iter_all_pages(
+        self,
+        batch: int = 50,
+        concurrency: int = 8
+    ) -> List[Page]:
+        '''
+        Get all pages belonging to a Telegraph account.
+
+        The first request learns total_count, the remaining offsets are then
+        fetched concurrently, at most ``concurrency`` at a time.
+
+        :param batch: Number of pages per getPageList request, between 1 and 200.
+        :type batch: int
+        :param concurrency: Maximum number of requests in flight.
+        :type concurrency: int
+        :return: Returns a list of Page objects, sorted by most recently created pages first.
+        :rtype: list[Page]
+        '''
+        if not 1 <= batch <= 200:
+            raise ValueError('batch must be between 1 and 200.')
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1.')
+
+        data = await self._request(
+            'getPageList',
+            **self._default_params,
+            offset=0,
+            limit=batch
+        )
+        page_list = self._decode_page_list(data)
+        pages = page_list.pages
+        batches = await _gather_limited(
+            (self.get_page_list(limit=batch, offset=offset) for offset in range(batch, page_list.total_count, batch)),
+            concurrency
+        )
+        for batch_pages in batches:
+            pages.extend(batch_pages)
         return pages
 
     async def get_views(
@@ -301,14 +673,41 @@ class Telegraph():
         :return: Returns a PageViews object on success. By default, the total number of page views will be returned.
         :rtype: PageViews
         '''
-        params = {
-            'year': year,
-            'month': month,
-            'day': day,
-            'hour': hour
-        }
-        data = await self._request('getViews', params)
-        views = PageViews(**data)
+        data = await self._request(
+            'getViews',
+            **self._default_params,
+            path=path,
+            year=year,
+            month=month,
+            day=day,
+            hour=hour
+        )
+        views = self._decode_page_views(data)
+        return views
+
+    async def get_many_views(
+        self,
+        paths: List[str],
+        year: int | None = None,
+        month: int | None = None,
+        day: int | None = None,
+        hour: int | None = None,
+        concurrency: int = 64
+    ) -> List[PageViews]:
+        '''
+        Get the number of views for several Telegraph articles concurrently.
+
+        See :meth:`get_views` for the meaning of the date filters, which are
+        applied to every path, and :meth:`get_pages` for ``concurrency``.
+
+        :param paths: Paths to the Telegraph pages.
+        :type paths: list[str]
+        :param concurrency: Maximum number of requests in flight.
+        :type concurrency: int
+        :return: Returns a list of PageViews objects in the order of paths.
+        :rtype: list[PageViews]
+        '''
+        views = await _gather_limited((self.get_views(path, year, month, day, hour) for path in paths), concurrency)
         return views
 
     async def revoke_access_token(
@@ -324,6 +723,7 @@ class Telegraph():
         :return: On success, returns an Account object with new access_token and auth_url fields.
         :rtype: Account
         '''
-        data = await self._request('getViews', {})
-        account = Account(**data)
+        data = await self._request('revokeAccessToken', **self._default_params)
+        account = self._decode_account(data)
+        self.access_token = account.access_token
         return account
\ No newline at end of file
@@ -1,18 +1,26 @@
+import sys
 from typing import Any, Optional
 from typing import List, Dict
 from dataclasses import dataclass
 
 
-@dataclass
+_ALLOWED_TAGS = frozenset({
+    'a', 'aside', 'b', 'blockquote', 'br', 'code', 'em', 'figcaption',
+    'figure', 'h3', 'h4', 'hr', 'i', 'iframe', 'img', 'li', 'ol', 'p',
+    'pre', 's', 'strong', 'u', 'ul', 'video'
+})
+
+
+@dataclass(slots=True)
 class Account:
-    short_name: str
-    author_name: str
-    author_url: str
+    short_name: Optional[str] = None
+    author_name: Optional[str] = None
+    author_url: Optional[str] = None
     access_token: Optional[str] = None
     auth_url: Optional[str] = None
-    page_count: Optional[str] = None
+    page_count: Optional[int] = None
 
-@dataclass
+@dataclass(slots=True)
 class NodeElement():
     '''
     This object represents a DOM element node.
@@ -29,27 +37,49 @@ class NodeElement():
         children (List[Union[str, NodeElement]] | None): Optional list of child nodes.  
             Each child is either a plain text string or another ``NodeElement``.  
             Example: ``["Hello, ", NodeElement(tag="b", children=["world!"])]``.
+
+    When a page is sent, children are serialized as they are: other values
+    are not dropped (``None`` becomes ``null``), and trees nested deeper than
+    about 127 elements exceed orjson's recursion limit.
     '''
     tag: str
     attrs: Optional[Dict[str, Any]] = None
     children: Optional[List['NodeElement']] = None
 
+    def __post_init__(self):
+        if self.tag not in _ALLOWED_TAGS:
+            raise ValueError(f'Tag {self.tag!r} is not allowed by Telegraph.')
+        self.tag = sys.intern(self.tag)
+
     def as_dict(self) -> Dict[str, Any]:
+        '''
+        Convert the tree to plain dicts. ``attrs`` dicts are shared, not copied.
+        '''
+        _NE = NodeElement
         result = {'tag': self.tag}
-        if self.attrs:
-            result['attrs'] = self.attrs.copy()
+        stack = [(self, result)]
+        push = stack.append
+        pop = stack.pop
+        while stack:
+            node, node_dict = pop()
+            if node.attrs:
+                node_dict['attrs'] = node.attrs
 
-        if self.children:
-            result['children'] = []
-            for child in self.children:
-                if isinstance(child, NodeElement):
-                    result['children'].append(child.as_dict())
-                elif isinstance(child, str):
-                    result['children'].append(child)
+            if node.children:
+                children = node_dict['children'] = []
+                append = children.append
+                for child in node.children:
+                    t = type(child)
+                    if t is str:
+                        append(child)
+                    elif t is _NE:
+                        child_dict = {'tag': child.tag}
+                        append(child_dict)
+                        push((child, child_dict))
 
         return result
 
-@dataclass
+@dataclass(slots=True)
 class Page():
     path: str
     url: str
@@ -62,11 +92,11 @@ class Page():
     views: Optional[int] = None
     can_edit: Optional[bool] = None
 
-@dataclass
+@dataclass(slots=True)
 class PageList():
-    total_count : str
+    total_count: int
     pages: List[Page]
 
-@dataclass
+@dataclass(slots=True)
 class PageViews():
     views: int
\ No newline at end of file
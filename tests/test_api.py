@@ -0,0 +1,214 @@
+import asyncio
+
+import aiohttp
+import orjson
+import pytest
+from aiohttp import web
+
+from telegraph import api
+from telegraph.api import Telegraph, TelegraphException
+from telegraph.types import NodeElement
+
+
+PAGE = {'path': 'Test-01-01', 'url': 'https://telegra.ph/Test-01-01', 'title': 'Test', 'description': ''}
+
+
+class FakeServer():
+    '''
+    Local Telegraph stand-in answering each request with the next scripted response.
+    '''
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = []
+        self.bodies = []
+        self.raw_bodies = []
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.calls.append(request.match_info['method'])
+        raw = await request.read()
+        self.raw_bodies.append(raw)
+        self.bodies.append(orjson.loads(raw))
+        response = self.responses.pop(0)
+        if isinstance(response, web.Response):
+            return response
+        return web.json_response(response)
+
+    async def run(self, scenario, **kwargs):
+        app = web.Application()
+        app.router.add_post('/{method}', self.handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        try:
+            async with Telegraph('token', **kwargs) as client:
+                client._urls = {
+                    method: type(url)(f'http://127.0.0.1:{port}/{method}') for method, url in client._urls.items()
+                }
+                return await scenario(client)
+        finally:
+            await runner.cleanup()
+
+
+def ok(result):
+    return {'ok': True, 'result': result}
+
+def error(status, **headers):
+    return web.Response(status=status, headers=headers)
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(api, '_backoff', lambda attempt: 0)
+
+
+@pytest.mark.parametrize('status', [429, 503])
+def test_read_is_retried(status):
+    server = FakeServer([error(status, **{'Retry-After': '0'}), ok({'views': 3})])
+    views = asyncio.run(server.run(lambda client: client.get_views('Test-01-01')))
+    assert views.views == 3
+    assert server.calls == ['getViews', 'getViews']
+
+def test_last_attempt_raises():
+    server = FakeServer([error(503) for _ in range(4)])
+    with pytest.raises(aiohttp.ClientResponseError):
+        asyncio.run(server.run(lambda client: client.get_page('Test-01-01')))
+    assert len(server.calls) == 4
+
+def test_write_not_retried_on_server_error():
+    server = FakeServer([error(502), ok(PAGE)])
+    with pytest.raises(aiohttp.ClientResponseError):
+        asyncio.run(server.run(lambda client: client.create_page('Test', [])))
+    assert server.calls == ['createPage']
+
+def test_write_retried_on_too_many_requests():
+    server = FakeServer([error(429), ok(PAGE)])
+    page = asyncio.run(server.run(lambda client: client.create_page('Test', [])))
+    assert page.path == PAGE['path']
+    assert server.calls == ['createPage', 'createPage']
+
+def test_flood_wait_is_retried():
+    server = FakeServer([{'ok': False, 'error': 'FLOOD_WAIT_0'}, ok(PAGE)])
+    page = asyncio.run(server.run(lambda client: client.create_page('Test', [])))
+    assert page.path == PAGE['path']
+    assert len(server.calls) == 2
+
+def test_long_flood_wait_raises():
+    server = FakeServer([{'ok': False, 'error': 'FLOOD_WAIT_3600'}])
+    with pytest.raises(TelegraphException, match='FLOOD_WAIT_3600'):
+        asyncio.run(server.run(lambda client: client.get_page('Test-01-01')))
+    assert len(server.calls) == 1
+
+def test_long_retry_after_raises():
+    server = FakeServer([error(429, **{'Retry-After': '3600'})])
+    with pytest.raises(TelegraphException, match='Retry-After'):
+        asyncio.run(server.run(lambda client: client.get_page('Test-01-01')))
+    assert len(server.calls) == 1
+
+def test_api_error_is_not_retried():
+    server = FakeServer([{'ok': False, 'error': 'PAGE_NOT_FOUND'}])
+    with pytest.raises(TelegraphException, match='PAGE_NOT_FOUND'):
+        asyncio.run(server.run(lambda client: client.get_page('Test-01-01')))
+    assert len(server.calls) == 1
+
+def test_httpx_transport_is_retried():
+    pytest.importorskip('h2')
+    server = FakeServer([error(503), ok({'views': 3})])
+    views = asyncio.run(server.run(lambda client: client.get_views('Test-01-01'), transport='httpx'))
+    assert views.views == 3
+    assert len(server.calls) == 2
+
+def test_session_must_match_transport():
+    with pytest.raises(TypeError, match='aiohttp transport'):
+        Telegraph(session=object())
+
+def test_msgspec_decoding():
+    pytest.importorskip('msgspec')
+    server = FakeServer([ok({'total_count': 1, 'pages': [{**PAGE, 'views': 5}]})])
+    pages = asyncio.run(server.run(lambda client: client.get_page_list(), use_msgspec=True))
+    assert pages[0].path == PAGE['path']
+    assert pages[0].views == 5
+    assert pages[0].author_name is None
+
+@pytest.mark.parametrize('kwargs', [{'batch': 0}, {'batch': -1}, {'batch': 201}, {'concurrency': 0}])
+def test_iter_all_pages_rejects_bad_arguments(kwargs):
+    server = FakeServer([])
+    with pytest.raises(ValueError):
+        asyncio.run(server.run(lambda client: client.iter_all_pages(**kwargs)))
+    assert server.calls == []
+
+@pytest.mark.parametrize('kwargs', [{'rate_limit': 0}, {'max_retries': -1}])
+def test_rejects_bad_limits(kwargs):
+    with pytest.raises(ValueError):
+        Telegraph(**kwargs)
+
+def test_get_pages_keeps_order():
+    server = FakeServer([ok({**PAGE, 'path': path}) for path in ('a', 'b', 'c')])
+    pages = asyncio.run(server.run(lambda client: client.get_pages(['a', 'b', 'c'], concurrency=1)))
+    assert [page.path for page in pages] == ['a', 'b', 'c']
+
+@pytest.mark.parametrize('method', ['get_pages', 'get_many_views'])
+def test_concurrency_must_be_positive(method):
+    server = FakeServer([])
+    with pytest.raises(ValueError, match='concurrency'):
+        asyncio.run(server.run(lambda client: getattr(client, method)(['a'], concurrency=0)))
+    assert server.calls == []
+
+def test_node_tree_body():
+    content = [
+        NodeElement('p', children=[
+            'Hello, ',
+            NodeElement('a', {'href': 'https://example.com'}, [NodeElement('b', children=['world'])]),
+            NodeElement('br', children=[])
+        ])
+    ]
+    server = FakeServer([ok(PAGE)])
+    asyncio.run(server.run(lambda client: client.create_page('Test', content)))
+    assert server.bodies[0] == {
+        'access_token': 'token',
+        'title': 'Test',
+        'content': [
+            {'tag': 'p', 'children': [
+                'Hello, ',
+                {'tag': 'a', 'attrs': {'href': 'https://example.com'}, 'children': [{'tag': 'b', 'children': ['world']}]},
+                {'tag': 'br'}
+            ]}
+        ],
+        'return_content': False
+    }
+
+def test_node_subclass_and_plain_children_are_sent_as_is():
+    class Paragraph(NodeElement):
+        pass
+
+    server = FakeServer([ok(PAGE)])
+    asyncio.run(server.run(lambda client: client.create_page('Test', [Paragraph('p', children=['a', 1, None])])))
+    assert server.bodies[0]['content'] == [{'tag': 'p', 'children': ['a', 1, None]}]
+
+def test_deep_tree_exceeds_recursion_limit():
+    node = NodeElement('b', children=['x'])
+    for _ in range(200):
+        node = NodeElement('b', children=[node])
+    server = FakeServer([])
+    with pytest.raises(orjson.JSONEncodeError):
+        asyncio.run(server.run(lambda client: client.create_page('Test', [node])))
+    assert server.calls == []
+
+@pytest.mark.parametrize('content', [b'[{"tag":"p"}]', '[{"tag":"p"}]'])
+def test_serialized_content_is_inlined(content):
+    server = FakeServer([ok(PAGE)])
+    asyncio.run(server.run(lambda client: client.edit_page('Test-01-01', 'Test', content)))
+    assert b'"content":[{"tag":"p"}]' in server.raw_bodies[0]
+
+def test_revoke_access_token():
+    server = FakeServer([ok({'access_token': 'new-token', 'auth_url': 'https://edit.telegra.ph/auth/x'})])
+
+    async def scenario(client):
+        account = await client.revoke_access_token()
+        return account, client.access_token
+
+    account, access_token = asyncio.run(server.run(scenario))
+    assert server.calls == ['revokeAccessToken']
+    assert server.bodies[0] == {'access_token': 'token'}
+    assert account.short_name is None
+    assert access_token == 'new-token'